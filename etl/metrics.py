@@ -0,0 +1,264 @@
+import numpy as np
+import pandas as pd
+
+## rolling form, streak and rating metrics for the game-indexed table
+# everything here is vectorized per column, except the rating recurrence which
+# loops once over games (not players) using numpy arrays -> linear in rows
+
+FORM_WINDOW = 5
+ELO_START = 1500.0
+ELO_K = 32.0
+WIN_PTS = 3.0 # team_pts for a win
+DRAW_PTS = 1.0 # team_pts for a draw (loss = 0)
+RANK_DECIMALS = 9 # cumulative sums are rounded to this before ranking (both engines)
+
+# per-row columns kept in the state; the cumulative totals come from the transform
+STATE_COLS = ['player', 'game_index', 'goals', 'total', 'cumulative_goals', 'cumulative_score',
+              'form_score', 'form_goals', 'scoring_streak', 'unbeaten_streak', 'elo_rating']
+
+
+def last_state(state):
+    """
+    state: per-player state from metric_state()
+    returns each player's most recent state row, indexed by player
+    """
+
+    return state.sort_values('game_index').groupby('player').tail(1).set_index('player')
+
+
+def rolling_form(df, window=FORM_WINDOW, state=None):
+    """
+    df: game-indexed dataframe with 'player', 'game_index', 'goals', 'total'
+    window: number of most recent games in the form window
+    state: optional per-player state from metric_state() - its rows seed the window
+    returns df with 'form_score' and 'form_goals' (mean over the last `window` games)
+    """
+
+    df = df.copy()
+    frame = df[['player', 'game_index', 'goals', 'total']].assign(_new=True)
+    if state is not None:
+        seed = state[['player', 'game_index', 'goals', 'total']].assign(_new=False)
+        frame = pd.concat([seed, frame], ignore_index=False)
+
+    # stable sort keeps original index so results line back up with df
+    frame = frame.sort_values(['player', 'game_index'], kind='stable')
+    grouped = frame.groupby('player', sort=False)
+    form_score = grouped['total'].rolling(window, min_periods=1).mean().droplevel(0)
+    form_goals = grouped['goals'].rolling(window, min_periods=1).mean().droplevel(0)
+
+    new_rows = frame['_new'].to_numpy()
+    df['form_score'] = pd.Series(form_score.to_numpy()[new_rows], index=frame.index[new_rows])
+    df['form_goals'] = pd.Series(form_goals.to_numpy()[new_rows], index=frame.index[new_rows])
+
+    return df
+
+
+def _streak(players, hit, seed=None):
+    """
+    players: player per row (rows sorted by player, then game)
+    hit: boolean series, True when the row extends the streak
+    seed: optional per-player streak carried in from a previous run
+    returns consecutive-hit count ending at each row
+    """
+
+    # every miss starts a new run, so counting hits within (player, run) gives the streak
+    run_id = (~hit).astype(int).groupby(players).cumsum()
+    streak = hit.astype(int).groupby([players, run_id]).cumsum()
+
+    if seed is not None:
+        # rows before a player's first miss continue the stored streak
+        carried = players.map(seed).fillna(0).astype(int)
+        streak = streak + carried.where(run_id == 0, 0)
+
+    return streak
+
+
+def add_streaks(df, state=None):
+    """
+    df: game-indexed dataframe with 'player', 'game_index', 'goals', 'team_pts', 'is_imputed'
+    state: optional per-player state from metric_state() to continue streaks from
+    returns df with 'scoring_streak' (games in a row with a goal) and
+    'unbeaten_streak' (games in a row with team_pts > 0)
+    imputed games neither extend nor break a streak - the previous value carries over
+    """
+
+    df = df.copy()
+    ordered = df.sort_values(['player', 'game_index'], kind='stable')
+    observed = ordered[~ordered['is_imputed'].astype(bool)]
+
+    latest = last_state(state) if state is not None else None
+
+    for col, hit in [('scoring_streak', observed['goals'] > 0),
+                     ('unbeaten_streak', observed['team_pts'] > 0)]:
+        seed = latest[col] if latest is not None else None
+        streak = _streak(observed['player'], hit, seed)
+
+        # imputed rows take the last observed value (or the stored streak)
+        filled = streak.reindex(ordered.index).groupby(ordered['player']).ffill()
+        if seed is not None:
+            filled = filled.fillna(ordered['player'].map(seed))
+        df[col] = filled.fillna(0).astype(int)
+
+    return df
+
+
+def elo_recurrence(player_codes, team_codes, games, team_pts, played, ratings, k=ELO_K):
+    """
+    player_codes, team_codes: int code per row
+    games: game_index per row - rows must be grouped by game, in play order
+    team_pts: team result per row
+    played: False for imputed rows
+    ratings: starting rating per player code, updated in place
+    k: rating update factor
+    returns (before, after) arrays - each row's rating before and after its game
+
+    teams are random each game, so a team's rating is the mean of its players' ratings.
+    each team is scored against the mean rating of the other teams that game,
+    with actual result win 1, draw 0.5, loss 0 (mapped from team_pts 3 / 1 / 0).
+    imputed rows did not play and keep their rating.
+    """
+
+    result = np.interp(team_pts, [0, DRAW_PTS, WIN_PTS], [0, 0.5, 1])
+    before = np.empty(len(games))
+    after = np.empty(len(games))
+
+    # --- one pass over games; each game is vectorized over its rows ---
+    bounds = np.flatnonzero(np.diff(games)) + 1
+    for rows in np.split(np.arange(len(games)), bounds):
+        p = player_codes[rows]
+        before[rows] = ratings[p]
+
+        rows_played = rows[played[rows]]
+        p_played = player_codes[rows_played]
+        teams, t = np.unique(team_codes[rows_played], return_inverse=True)
+        if len(teams) > 1:
+            size = np.bincount(t)
+            team_rating = np.bincount(t, weights=ratings[p_played]) / size
+            field_rating = (team_rating.sum() - team_rating) / (len(teams) - 1)
+            expected = 1 / (1 + 10 ** ((field_rating - team_rating) / 400))
+            actual = np.bincount(t, weights=result[rows_played]) / size
+            ratings[p_played] += k * (actual - expected)[t]
+
+        after[rows] = ratings[p]
+
+    return before, after
+
+
+def add_elo(df, state=None, k=ELO_K, start=ELO_START):
+    """
+    df: game-indexed dataframe with 'player', 'game_index', 'team', 'team_pts', 'is_imputed'
+    state: optional per-player state from metric_state() - ratings start from the stored values
+    k: rating update factor
+    start: rating for players with no stored state
+    returns df with 'elo_rating' (rating after the game) and 'elo_change' - see elo_recurrence()
+    """
+
+    df = df.copy()
+    ordered = df.sort_values(['game_index', 'player'], kind='stable')
+
+    # --- encode players and teams as ints for array ops ---
+    player_codes, player_names = pd.factorize(ordered['player'])
+    ratings = np.full(len(player_names), start, dtype=float)
+    if state is not None:
+        stored = pd.Series(player_names).map(last_state(state)['elo_rating']).to_numpy(dtype=float)
+        ratings = np.where(np.isnan(stored), start, stored)
+
+    team_codes, _ = pd.factorize(ordered['team'])
+    before, after = elo_recurrence(
+        player_codes, team_codes,
+        ordered['game_index'].to_numpy(),
+        ordered['team_pts'].to_numpy(dtype=float),
+        ~ordered['is_imputed'].astype(bool).to_numpy(),
+        ratings, k=k
+    )
+
+    df['elo_rating'] = pd.Series(after, index=ordered.index)
+    df['elo_change'] = pd.Series(after - before, index=ordered.index)
+
+    return df
+
+
+def add_game_metrics(df, window=FORM_WINDOW, state=None):
+    """
+    df: game-indexed dataframe (new games only when state is given)
+    window: rolling form window
+    state: optional per-player state from metric_state() for incremental updates
+    returns df with form, streak and elo columns added
+    """
+
+    df = rolling_form(df, window=window, state=state)
+    df = add_streaks(df, state=state)
+    df = add_elo(df, state=state)
+    return df
+
+
+def summarize_game_metrics(df, state=None):
+    """
+    df: game-indexed dataframe after add_game_metrics()
+    state: optional per-player state the df continues from
+    returns one row per player with latest form, streaks and rating
+    with state, longest streaks and peak rating cover the stored games too,
+    and players with no new games keep their stored values
+    """
+
+    ordered = df.sort_values(['player', 'game_index'], kind='stable')
+    summary = ordered.groupby('player').agg(
+        form_score=('form_score', 'last'),
+        form_goals=('form_goals', 'last'),
+        current_scoring_streak=('scoring_streak', 'last'),
+        longest_scoring_streak=('scoring_streak', 'max'),
+        current_unbeaten_streak=('unbeaten_streak', 'last'),
+        longest_unbeaten_streak=('unbeaten_streak', 'max'),
+        elo_rating=('elo_rating', 'last'),
+        peak_elo_rating=('elo_rating', 'max')
+    ).reset_index()
+
+    if state is None:
+        return summary
+
+    # stored rows go first, so 'last' prefers the new games where a player has any
+    latest = last_state(state)
+    prior = pd.DataFrame({
+        'form_score': latest['form_score'],
+        'form_goals': latest['form_goals'],
+        'current_scoring_streak': latest['scoring_streak'],
+        'longest_scoring_streak': latest['longest_scoring_streak'],
+        'current_unbeaten_streak': latest['unbeaten_streak'],
+        'longest_unbeaten_streak': latest['longest_unbeaten_streak'],
+        'elo_rating': latest['elo_rating'],
+        'peak_elo_rating': latest['peak_elo_rating']
+    }).reset_index()
+    return pd.concat([prior, summary], ignore_index=True).groupby('player').agg(
+        form_score=('form_score', 'last'),
+        form_goals=('form_goals', 'last'),
+        current_scoring_streak=('current_scoring_streak', 'last'),
+        longest_scoring_streak=('longest_scoring_streak', 'max'),
+        current_unbeaten_streak=('current_unbeaten_streak', 'last'),
+        longest_unbeaten_streak=('longest_unbeaten_streak', 'max'),
+        elo_rating=('elo_rating', 'last'),
+        peak_elo_rating=('peak_elo_rating', 'max')
+    ).reset_index()
+
+
+def metric_state(df, window=FORM_WINDOW, summary=None, state=None):
+    """
+    df: game-indexed dataframe after add_game_metrics()
+    window: rolling form window the state will be used with
+    summary: player summary to carry season values from - player_summary from the
+             transform, which adds its own season totals; defaults to summarize_game_metrics()
+    state: the state df was computed from, so players without new games are kept
+    returns each player's last window-1 rows (at least one) plus season values -
+    enough to continue game metrics and the summary when only new games are transformed
+    """
+
+    frame = df if state is None else pd.concat([state, df], ignore_index=True)
+    if summary is None:
+        summary = summarize_game_metrics(df, state=state)
+
+    row_cols = [c for c in STATE_COLS if c in frame.columns]
+    ordered = frame.sort_values(['player', 'game_index'], kind='stable')
+    tail = ordered.groupby('player').tail(max(window - 1, 1))[row_cols]
+
+    # season values repeat on each of a player's rows
+    season_cols = ['player'] + [c for c in summary.columns if c not in row_cols]
+    return tail.merge(summary[season_cols], on='player', how='left').reset_index(drop=True)
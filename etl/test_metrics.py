@@ -0,0 +1,103 @@
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from metrics import elo_recurrence, metric_state, ELO_START
+from transform_game_data import transform_pandas, data_staged
+
+## rating rules and incremental (state) runs
+# run from etl/: python -m pytest test_metrics.py
+
+STAGED = os.path.join(os.path.dirname(__file__), data_staged)
+needs_staged = pytest.mark.skipif(not os.path.exists(STAGED), reason='no staged data')
+
+
+def run_game(ratings, teams, team_pts):
+    """
+    ratings: starting rating per player
+    teams: team code per player
+    team_pts: team_pts per player
+    returns (before, after) for a single game with everyone playing
+    """
+
+    n = len(ratings)
+    return elo_recurrence(
+        np.arange(n), np.array(teams), np.ones(n, dtype=int),
+        np.array(team_pts, dtype=float), np.ones(n, dtype=bool),
+        np.array(ratings, dtype=float)
+    )
+
+
+def test_draw_between_equal_teams_keeps_ratings():
+    before, after = run_game([ELO_START] * 4, [0, 0, 1, 1], [1, 1, 1, 1])
+    np.testing.assert_allclose(after, before)
+
+
+@pytest.mark.parametrize('team_pts', [[3, 3, 0, 0], [1, 1, 1, 1], [0, 0, 3, 3]])
+def test_two_team_game_is_zero_sum(team_pts):
+    before, after = run_game([1400, 1550, 1500, 1620], [0, 0, 1, 1], team_pts)
+    assert (after - before).sum() == pytest.approx(0, abs=1e-9)
+
+
+def test_win_beats_draw_beats_loss():
+    _, after = run_game([ELO_START] * 6, [0, 0, 1, 1, 2, 2], [3, 3, 1, 1, 0, 0])
+    assert after[0] > after[2] > after[4]
+
+
+def assert_incremental_matches(tmp_path, df, cuts):
+    """
+    df: staged-format rows
+    cuts: game_index values to stop at - each later run continues from the previous state
+    fails unless every incremental run matches the same games of a full run
+    """
+
+    full_path = tmp_path / 'full.csv'
+    df.to_csv(full_path, index=False)
+    full_game, full_summary = transform_pandas(str(full_path))
+
+    part_path = tmp_path / 'part.csv'
+    df[df['game_index'] <= cuts[0]].to_csv(part_path, index=False)
+    game, summary = transform_pandas(str(part_path))
+    state = metric_state(game, summary=summary)
+
+    for start, stop in zip(cuts, cuts[1:] + [df['game_index'].max()]):
+        step_path = tmp_path / f'upto_{stop}.csv'
+        df[df['game_index'] <= stop].to_csv(step_path, index=False)
+
+        # round-trip the state through csv like the transform script does
+        state_path = tmp_path / 'state.csv'
+        state.to_csv(state_path, index=False)
+        state = pd.read_csv(state_path)
+
+        game, summary = transform_pandas(str(step_path), state=state)
+        state = metric_state(game, summary=summary, state=state)
+
+        expected = full_game[(full_game['game_index'] > start) & (full_game['game_index'] <= stop)]
+        pd.testing.assert_frame_equal(
+            game.reset_index(drop=True), expected.reset_index(drop=True),
+            check_dtype=False, check_exact=False, rtol=1e-9, obj=f'game_indexed after {start}'
+        )
+
+    pd.testing.assert_frame_equal(
+        summary, full_summary, check_dtype=False, check_exact=False, rtol=1e-9, obj='player_summary'
+    )
+
+
+@needs_staged
+@pytest.mark.parametrize('cut', [3, 10, 20, 38])
+def test_incremental_matches_full_run(tmp_path, cut):
+    assert_incremental_matches(tmp_path, pd.read_csv(STAGED), [cut])
+
+
+@needs_staged
+def test_chained_incremental_runs(tmp_path):
+    assert_incremental_matches(tmp_path, pd.read_csv(STAGED), [10, 25])
+
+
+@needs_staged
+def test_player_first_seen_after_cut(tmp_path):
+    df = pd.read_csv(STAGED)
+    late = (df['last'] == df['last'].iloc[0]) & (df['first'] == df['first'].iloc[0]) & (df['game_index'] <= 15)
+    assert_incremental_matches(tmp_path, df[~late], [10])
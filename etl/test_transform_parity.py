@@ -0,0 +1,119 @@
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from transform_game_data import transform_pandas, data_staged
+
+## parity between the pandas and polars transform engines
+# run from etl/: python -m pytest test_transform_parity.py
+
+pytest.importorskip('polars')
+from transform_polars import transform_polars
+
+STAGED = os.path.join(os.path.dirname(__file__), data_staged)
+TEAMS = ['Pink', 'Blue', 'Yellow', 'Jerseys']
+
+
+def assert_parity(path, window=5):
+    """
+    runs both engines on path and fails if their outputs differ
+    floats are compared with a tolerance since the engines sum in a different order
+    """
+
+    expected = transform_pandas(path, window=window)
+    actual = transform_polars(path, window=window)
+
+    for name, exp, act in zip(['game_indexed', 'player_summary'], expected, actual):
+        assert list(exp.columns) == list(act.columns), f"{name}: columns differ"
+        pd.testing.assert_frame_equal(
+            exp.reset_index(drop=True), act.reset_index(drop=True),
+            check_dtype=False, check_exact=False, rtol=1e-9, obj=name
+        )
+
+
+def make_games(n_players=8, n_games=6, seed=0):
+    """
+    returns staged-format player-game rows: random 2-player teams, win 3 / draw 1 / loss 0
+    """
+
+    rng = np.random.default_rng(seed)
+    rows = []
+    for game in range(1, n_games + 1):
+        order = rng.permutation(n_players)
+        for pair in range(2):
+            outcome = rng.choice([(3, 0), (1, 1), (0, 3)])
+            for side in range(2):
+                team = TEAMS[2 * pair + side]
+                for i in order[(2 * pair + side) * 2:(2 * pair + side) * 2 + 2]:
+                    goals = float(rng.integers(0, 3))
+                    rows.append({
+                        'last': f'Last{i}', 'first': f'First{i}', 'team': team,
+                        'team_pts': float(outcome[side]), 'goals': goals,
+                        'total': outcome[side] + goals, 'game_index': game,
+                        'is_imputed': False, 'impute_method': 'observed'
+                    })
+    return pd.DataFrame(rows)
+
+
+def impute(df, mask, goals, team_pts):
+    """
+    marks rows in mask as imputed with the given (fractional) averages
+    """
+
+    df = df.copy()
+    df.loc[mask, ['team', 'goals', 'team_pts', 'is_imputed', 'impute_method']] = \
+        ['Out', goals, team_pts, True, 'player_average']
+    df.loc[mask, 'total'] = df.loc[mask, 'goals'] + df.loc[mask, 'team_pts']
+    return df
+
+
+@pytest.fixture
+def write_csv(tmp_path):
+    def write(df):
+        path = tmp_path / 'player_game_stats.csv'
+        df.to_csv(path, index=False)
+        return str(path)
+    return write
+
+
+@pytest.mark.skipif(not os.path.exists(STAGED), reason='no staged data')
+def test_staged_file():
+    assert_parity(STAGED)
+
+
+@pytest.mark.skipif(not os.path.exists(STAGED), reason='no staged data')
+def test_shuffled_rows(write_csv):
+    df = pd.read_csv(STAGED).sample(frac=1, random_state=1)
+    assert_parity(write_csv(df))
+
+
+def test_shuffled_synthetic(write_csv):
+    df = make_games().sample(frac=1, random_state=2)
+    assert_parity(write_csv(df))
+
+
+def test_tied_cumulative_scores(write_csv):
+    # same season totals reached through fractional values in a different order,
+    # so the raw float sums differ in the last bit
+    df = make_games()
+    a = (df['last'] == 'Last0') & df['game_index'].isin([1, 2, 3])
+    b = (df['last'] == 'Last1') & df['game_index'].isin([1, 2, 3])
+    df = impute(df, a, goals=0.1, team_pts=0.0)
+    df = impute(df, b, goals=0.1, team_pts=0.0)
+    df.loc[a, 'goals'] = [0.1, 0.2, 0.3]
+    df.loc[b, 'goals'] = [0.3, 0.2, 0.1]
+    df['total'] = df['goals'] + df['team_pts']
+    assert_parity(write_csv(df))
+
+
+def test_first_rows_imputed(write_csv):
+    df = make_games()
+    df = impute(df, (df['last'] == 'Last2') & (df['game_index'] <= 2), goals=0.5, team_pts=1.5)
+    assert_parity(write_csv(df))
+
+
+@pytest.mark.parametrize('window', [1, 3])
+def test_other_windows(write_csv, window):
+    assert_parity(write_csv(make_games(n_games=8)), window=window)
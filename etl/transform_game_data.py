@@ -1,42 +1,140 @@
 import pandas as pd
 import os
+import argparse
 from datetime import datetime
 
+from metrics import add_game_metrics, summarize_game_metrics, metric_state, last_state, FORM_WINDOW, RANK_DECIMALS
+
 data_staged = '../data/staged/player_game_stats.csv'
-df = pd.read_csv(data_staged)
 
-df['player'] = df['first'] + ' ' + df['last']
 
-## add more per game metrics to game-indexed table
+# season totals carried in the metric state so player_summary can be continued
+SEASON_TOTALS = ['total_goals', 'overall_score', 'games_played_total',
+                 'games_played_actual', 'max_total', 'min_total']
+
+
+def transform_pandas(path=data_staged, window=FORM_WINDOW, state=None):
+    """
+    path: staged player-game csv from extract_raw_excel.py
+    window: rolling form window
+    state: optional metric state from a previous run - only games after it are
+           transformed, continuing from the stored totals, streaks and ratings
+    returns (game_indexed, player_summary) dataframes
+    with state, game_indexed holds the new games only; player_summary covers the season
+    """
+
+    # cumulative sums below run in row order, so put each player's rows in game order
+    df = pd.read_csv(path).sort_values('game_index', kind='stable').reset_index(drop=True)
+
+    df['player'] = df['first'] + ' ' + df['last']
+
+    if state is not None:
+        df = df[df['game_index'] > state['game_index'].max()].copy()
+        if df.empty:
+            raise ValueError("No games after the stored state.")
+
+    ## add more per game metrics to game-indexed table
+
+    df['rank_in_game'] = df.groupby('game_index')['total'].rank(ascending=False, method='min')
+
+    # cumulative totals and ranks
+    df['cumulative_goals'] = df.groupby('player')['goals'].cumsum()
+    df['cumulative_score'] = df.groupby('player')['total'].cumsum()
+    if state is not None:
+        latest = last_state(state)
+        df['cumulative_goals'] += df['player'].map(latest['cumulative_goals']).fillna(0)
+        df['cumulative_score'] += df['player'].map(latest['cumulative_score']).fillna(0)
+    # rank on rounded sums so tied players stay tied regardless of float summation order
+    score_key = df['cumulative_score'].round(RANK_DECIMALS)
+    goals_key = df['cumulative_goals'].round(RANK_DECIMALS)
+    df['cumulative_rank'] = score_key.groupby(df['game_index']).rank(ascending=False, method='min')
+
+    # percentile ranks
+    df['cumulative_percentile'] = score_key.groupby(df['game_index']).rank(pct=True)
+    df['cumulative_goals_percentile'] = goals_key.groupby(df['game_index']).rank(pct=True)
+
+    # rolling form, streaks and elo rating (see metrics.py)
+    df = add_game_metrics(df, window=window, state=state)
+
+    ## make player summary for season aggregates - avoid game index table redundancy
+    player_summary = df.groupby('player').agg(
+        total_goals=('goals', 'sum'),
+        overall_score=('total', 'sum'),
+        avg_score_per_game=('total', 'mean'),
+        games_played_total=('game_index','count'),
+        games_played_actual=('is_imputed', lambda x: (x==0).sum()),
+        max_total=('total','max'),
+        min_total=('total','min'),
+        avg_goals_per_game=('goals','mean')
+    ).reset_index()
+
+    if state is not None:
+        player_summary = continue_summary(player_summary, state)
+
+    player_summary = player_summary.merge(summarize_game_metrics(df, state=state), on='player', how='left')
+
+    return df, player_summary
+
+
+def continue_summary(player_summary, state):
+    """
+    player_summary: season aggregates for the new games only
+    state: metric state the new games continue from
+    returns season aggregates over the stored and new games
+    """
+
+    columns = player_summary.columns
+    prior = last_state(state).reset_index()[['player'] + SEASON_TOTALS]
+
+    # stored rows go first; players without new games keep their stored totals
+    player_summary = pd.concat([prior, player_summary[['player'] + SEASON_TOTALS]]).groupby('player').agg(
+        total_goals=('total_goals', 'sum'),
+        overall_score=('overall_score', 'sum'),
+        games_played_total=('games_played_total', 'sum'),
+        games_played_actual=('games_played_actual', 'sum'),
+        max_total=('max_total', 'max'),
+        min_total=('min_total', 'min')
+    ).reset_index()
+    player_summary['avg_score_per_game'] = player_summary['overall_score'] / player_summary['games_played_total']
+    player_summary['avg_goals_per_game'] = player_summary['total_goals'] / player_summary['games_played_total']
+
+    return player_summary[columns]
+
+
+def transform(engine='pandas', path=data_staged, window=FORM_WINDOW, state=None):
+    """
+    engine: 'pandas' (default) or 'polars' (lazy, multi-threaded - see transform_polars.py)
+    state: optional metric state for an incremental run (pandas engine only)
+    returns (game_indexed, player_summary) as pandas dataframes
+    """
 
-df['rank_in_game'] = df.groupby('game_index')['total'].rank(ascending=False, method='min')
+    if engine == 'polars':
+        if state is not None:
+            raise ValueError("Incremental runs from a state file need the pandas engine.")
+        # only needed for this engine
+        from transform_polars import transform_polars
+        return transform_polars(path, window=window)
+    return transform_pandas(path, window=window, state=state)
 
-# cumulative totals and ranks
-df['cumulative_goals'] = df.groupby('player')['goals'].cumsum()
-df['cumulative_score'] = df.groupby('player')['total'].cumsum()
-df['cumulative_rank'] = df.groupby('game_index')['cumulative_score'].rank(ascending=False, method='min')
 
-# percentile ranks
-df['cumulative_percentile'] = df.groupby('game_index')['cumulative_score'].rank(pct=True)
-df['cumulative_goals_percentile'] = df.groupby('game_index')['cumulative_goals'].rank(pct=True)
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Build game_indexed and player_summary tables.')
+    parser.add_argument('--engine', choices=['pandas', 'polars'], default='pandas')
+    parser.add_argument('--state', help='metric_state csv from a previous run - transform only later games')
+    args = parser.parse_args()
 
-## make player summary for season aggregates - avoid game index table redundancy
-player_summary = df.groupby('player').agg(
-    total_goals=('goals', 'sum'),
-    overall_score=('total', 'sum'),
-    avg_score_per_game=('total', 'mean'),
-    games_played_total=('game_index','count'),
-    games_played_actual=('is_imputed', lambda x: (x==0).sum()),
-    max_total=('total','max'),
-    min_total=('total','min'),
-    avg_goals_per_game=('goals','mean')
-).reset_index()
+    state = pd.read_csv(args.state) if args.state else None
+    df, player_summary = transform(args.engine, state=state)
 
-## export
-output_folder = 'etl_output'
-os.makedirs(output_folder, exist_ok=True)
-ts = datetime.now().strftime('%Y%m%d')
+    ## export
+    output_folder = 'etl_output'
+    os.makedirs(output_folder, exist_ok=True)
+    ts = datetime.now().strftime('%Y%m%d')
 
-df.to_csv(os.path.join(output_folder, f'game_indexed_{ts}.csv'), index=False)
-player_summary.to_csv(os.path.join(output_folder, f'player_summary_{ts}.csv'), index=False)
+    # an incremental run only has the new games - keep it apart from full tables
+    game_file = f'game_indexed_new_{ts}.csv' if state is not None else f'game_indexed_{ts}.csv'
+    df.to_csv(os.path.join(output_folder, game_file), index=False)
+    player_summary.to_csv(os.path.join(output_folder, f'player_summary_{ts}.csv'), index=False)
 
+    # per-player state so later games can be added without recomputing the season
+    metric_state(df, window=FORM_WINDOW, summary=player_summary, state=state).to_csv(os.path.join(output_folder, f'metric_state_{ts}.csv'), index=False)
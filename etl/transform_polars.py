@@ -0,0 +1,126 @@
+import numpy as np
+import polars as pl
+
+from metrics import elo_recurrence, FORM_WINDOW, ELO_START, RANK_DECIMALS
+
+## polars version of transform_pandas() in transform_game_data.py
+# the whole query is built lazily, so polars can plan it, run the window
+# expressions on all cores, and stream the csv instead of materializing
+# every groupby result. outputs match the pandas engine column for column
+# (see test_transform_parity.py).
+
+
+def game_metrics_query(path, window=FORM_WINDOW):
+    """
+    path: staged player-game csv
+    window: rolling form window
+    returns LazyFrame for the game-indexed table (everything except elo)
+    """
+
+    observed = ~pl.col('is_imputed')
+    # polars and pandas cumsums can differ in the last bit, so rank on rounded sums
+    score_key = pl.col('cumulative_score').round(RANK_DECIMALS)
+    goals_key = pl.col('cumulative_goals').round(RANK_DECIMALS)
+
+    return (
+        pl.scan_csv(path)
+        # window expressions below run in row order, so put each player's rows in game order
+        .sort('game_index', maintain_order=True)
+        .with_columns((pl.col('first') + ' ' + pl.col('last')).alias('player'))
+        .with_columns(
+            pl.col('total').rank('min', descending=True).over('game_index').cast(pl.Float64).alias('rank_in_game'),
+            # cumulative totals
+            pl.col('goals').cum_sum().over('player').alias('cumulative_goals'),
+            pl.col('total').cum_sum().over('player').alias('cumulative_score'),
+        )
+        .with_columns(
+            score_key.rank('min', descending=True).over('game_index').cast(pl.Float64).alias('cumulative_rank'),
+            # percentile ranks, same as pandas rank(pct=True)
+            (score_key.rank('average') / pl.len()).over('game_index').alias('cumulative_percentile'),
+            (goals_key.rank('average') / pl.len()).over('game_index').alias('cumulative_goals_percentile'),
+        )
+        # rolling form
+        .with_columns(
+            pl.col('total').rolling_mean(window, min_samples=1).over('player').alias('form_score'),
+            pl.col('goals').rolling_mean(window, min_samples=1).over('player').alias('form_goals'),
+        )
+        # streaks: a played game without a hit starts a new run; imputed rows
+        # add nothing and break nothing, so they carry the previous value
+        .with_columns(
+            (observed & (pl.col('goals') <= 0)).cum_sum().over('player').alias('_scoring_run'),
+            (observed & (pl.col('team_pts') <= 0)).cum_sum().over('player').alias('_unbeaten_run'),
+        )
+        .with_columns(
+            (observed & (pl.col('goals') > 0)).cast(pl.Int64).cum_sum()
+              .over(['player', '_scoring_run']).alias('scoring_streak'),
+            (observed & (pl.col('team_pts') > 0)).cast(pl.Int64).cum_sum()
+              .over(['player', '_unbeaten_run']).alias('unbeaten_streak'),
+        )
+        .drop('_scoring_run', '_unbeaten_run')
+    )
+
+
+def summary_query(games):
+    """
+    games: LazyFrame of the finished game-indexed table
+    returns LazyFrame for player_summary
+    """
+
+    last_game = pl.col('game_index').arg_max()
+
+    return (
+        games
+        .group_by('player')
+        .agg(
+            pl.col('goals').sum().alias('total_goals'),
+            pl.col('total').sum().alias('overall_score'),
+            pl.col('total').mean().alias('avg_score_per_game'),
+            pl.col('game_index').count().alias('games_played_total'),
+            # vectorized instead of a python lambda per player
+            (~pl.col('is_imputed')).sum().cast(pl.Int64).alias('games_played_actual'),
+            pl.col('total').max().alias('max_total'),
+            pl.col('total').min().alias('min_total'),
+            pl.col('goals').mean().alias('avg_goals_per_game'),
+            # latest form, streaks and rating
+            pl.col('form_score').get(last_game).alias('form_score'),
+            pl.col('form_goals').get(last_game).alias('form_goals'),
+            pl.col('scoring_streak').get(last_game).alias('current_scoring_streak'),
+            pl.col('scoring_streak').max().alias('longest_scoring_streak'),
+            pl.col('unbeaten_streak').get(last_game).alias('current_unbeaten_streak'),
+            pl.col('unbeaten_streak').max().alias('longest_unbeaten_streak'),
+            pl.col('elo_rating').get(last_game).alias('elo_rating'),
+            pl.col('elo_rating').max().alias('peak_elo_rating'),
+        )
+        .sort('player')
+    )
+
+
+def transform_polars(path, window=FORM_WINDOW, engine='streaming'):
+    """
+    path: staged player-game csv
+    window: rolling form window
+    engine: polars collect engine - 'streaming' processes the csv in batches
+    returns (game_indexed, player_summary) as pandas dataframes
+
+    the elo recurrence runs game by game over the whole season, so the
+    game-indexed table is collected once and the rating arrays come straight
+    from it. the outputs are converted to pandas at the end for the shared export.
+    """
+
+    games = game_metrics_query(path, window).collect(engine=engine)
+
+    # --- elo on numpy arrays; rows are already in game order ---
+    players, player_codes = np.unique(games['player'].to_numpy(), return_inverse=True)
+    _, team_codes = np.unique(games['team'].to_numpy(), return_inverse=True)
+    before, after = elo_recurrence(
+        player_codes, team_codes,
+        games['game_index'].to_numpy(),
+        games['team_pts'].to_numpy().astype(float),
+        ~games['is_imputed'].to_numpy(),
+        np.full(len(players), ELO_START)
+    )
+    games = games.with_columns(pl.Series('elo_rating', after), pl.Series('elo_change', after - before))
+
+    player_summary = summary_query(games.lazy()).collect(engine=engine)
+
+    return games.to_pandas(), player_summary.to_pandas()
@@ -0,0 +1,218 @@
+import argparse
+import hashlib
+import html
+import json
+import os
+import re
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+
+import pandas as pd
+
+import loaders
+from panels import VIEWS, view_players, filter_view, default_players
+
+## static snapshot of the standard dashboard views
+# run after each etl load (after etl/load_to_postgres.py). every view's figures
+# are rendered once, in parallel, into a versioned folder of html + plotly json
+# that any static file server can host - no python or database at view time.
+#
+# snapshots/
+#   index.html            -> redirects to the latest version
+#   latest.json
+#   <version>/
+#     index.html          view list
+#     plotly.min.js       shared by every page, so the bundle works offline
+#     manifest.json
+#     <view>.html
+#     <view>/<figure>.json
+
+SNAPSHOT_DIR = 'snapshots'
+FIGURES = ['cumulative', 'bubble', 'histogram', 'heatmap', 'points_vs_goals', 'points_vs_rank']
+
+PAGE = """<!DOCTYPE html>
+<html>
+<head>
+<meta charset="utf-8">
+<title>{title}</title>
+<script src="plotly.min.js"></script>
+</head>
+<body style="font-family: sans-serif">
+<p><a href="index.html">All views</a> &middot; snapshot {version}</p>
+<h1>{title}</h1>
+{body}
+</body>
+</html>
+"""
+
+
+def slugify(name):
+    """
+    returns lowercase file-safe name, e.g. "Top 5 Overall" -> "top_5_overall"
+    """
+
+    return re.sub(r'[^a-z0-9]+', '_', name.lower()).strip('_') or 'view'
+
+
+def unique_slugs(titles):
+    """
+    returns one slug per title, adding _2, _3, ... where slugify() collides
+    (e.g. names differing only in punctuation or non-ascii letters)
+    """
+
+    slugs = []
+    taken = set()
+    for title in titles:
+        base = slug = slugify(title)
+        n = 1
+        while slug in taken:
+            n += 1
+            slug = f'{base}_{n}'
+        taken.add(slug)
+        slugs.append(slug)
+    return slugs
+
+
+def standard_views(df_game, per_player=True):
+    """
+    df_game: game_indexed table
+    per_player: also add a view for every single player
+    returns list of (title, slug, players) - players is None for everyone;
+    slugs are unique, so views never share a file
+    """
+
+    views = []
+    for mode in VIEWS:
+        players = default_players(df_game) if mode == "Select Players" else None
+        views.append((mode, view_players(df_game, mode, players)))
+
+    if per_player:
+        for player in sorted(df_game["player"].unique()):
+            views.append((player, [player]))
+
+    slugs = unique_slugs([title for title, _ in views])
+    return [(title, slug, players) for (title, players), slug in zip(views, slugs)]
+
+
+def render_view(out_dir, version, title, slug, filtered_game, filtered_summary):
+    """
+    slug: unique file name for the view, from standard_views()
+    renders one view's figures to <slug>.html and <slug>/<figure>.json
+    runs in a worker process
+    returns manifest entry for the view
+    """
+
+    from utils import plot_cumulative, plot_bubble, player_histogram, create_heatmap, plot_goals_and_rank
+
+    fig1, fig2 = plot_goals_and_rank(filtered_summary, color_by="Position")
+    figures = dict(zip(FIGURES, [
+        plot_cumulative(filtered_game),
+        plot_bubble(filtered_game),
+        player_histogram(filtered_game),
+        create_heatmap(filtered_game),
+        fig1,
+        fig2,
+    ]))
+
+    os.makedirs(os.path.join(out_dir, slug), exist_ok=True)
+
+    divs = []
+    for name, fig in figures.items():
+        with open(os.path.join(out_dir, slug, f'{name}.json'), 'w') as f:
+            f.write(fig.to_json())
+        divs.append(fig.to_html(full_html=False, include_plotlyjs=False))
+
+    with open(os.path.join(out_dir, f'{slug}.html'), 'w') as f:
+        f.write(PAGE.format(title=html.escape(title), version=version, body='\n'.join(divs)))
+
+    return {
+        'title': title,
+        'page': f'{slug}.html',
+        'figures': {name: f'{slug}/{name}.json' for name in figures},
+        'players': sorted(filtered_game["player"].unique().tolist()),
+    }
+
+
+def data_version(df_game, df_summary):
+    """
+    returns version string: export time plus a short hash of the data,
+    so reruns on the same load are easy to spot
+    """
+
+    digest = hashlib.sha256()
+    for df in [df_game, df_summary]:
+        digest.update(pd.util.hash_pandas_object(df, index=False).values.tobytes())
+    return f"{datetime.now().strftime('%Y%m%d_%H%M%S')}_{digest.hexdigest()[:8]}"
+
+
+def export_snapshot(df_game, df_summary, root=SNAPSHOT_DIR, per_player=True, workers=None):
+    """
+    df_game: game_indexed table
+    df_summary: player_summary with roster columns (see loaders.load_summary)
+    root: folder holding all snapshot versions
+    per_player: also export single-player views
+    workers: process count, default all cores
+    returns path of the new version folder
+    """
+
+    from plotly.offline import get_plotlyjs
+
+    version = data_version(df_game, df_summary)
+    out_dir = os.path.join(root, version)
+    os.makedirs(out_dir, exist_ok=True)
+
+    with open(os.path.join(out_dir, 'plotly.min.js'), 'w') as f:
+        f.write(get_plotlyjs())
+
+    # --- render views in parallel ---
+    views = standard_views(df_game, per_player=per_player)
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        jobs = [pool.submit(render_view, out_dir, version, title, slug, *filter_view(df_game, df_summary, players))
+                for title, slug, players in views]
+        entries = [job.result() for job in jobs]
+
+    # --- index pages and manifest ---
+    manifest = {'version': version, 'created': datetime.now().isoformat(timespec='seconds'), 'views': entries}
+    with open(os.path.join(out_dir, 'manifest.json'), 'w') as f:
+        json.dump(manifest, f, indent=2)
+
+    links = '\n'.join(f'<li><a href="{e["page"]}">{html.escape(e["title"])}</a></li>' for e in entries)
+    with open(os.path.join(out_dir, 'index.html'), 'w') as f:
+        f.write(PAGE.format(title="Soccer Player Rankings", version=version, body=f'<ul>\n{links}\n</ul>'))
+
+    # point the root at this version last, so viewers never see a half-written bundle
+    replace_file(os.path.join(root, 'latest.json'), json.dumps({'version': version}))
+    replace_file(os.path.join(root, 'index.html'),
+                 f'<!DOCTYPE html>\n<meta http-equiv="refresh" content="0; url={version}/index.html">\n')
+
+    return out_dir
+
+
+def replace_file(path, text):
+    """
+    writes text to a temp file next to path, then swaps it in with os.replace
+    so readers see either the old or the new file, never a partial one
+    """
+
+    tmp_path = f'{path}.tmp'
+    with open(tmp_path, 'w') as f:
+        f.write(text)
+    os.replace(tmp_path, path)
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Export the standard dashboard views as a static bundle.')
+    parser.add_argument('--out', default=SNAPSHOT_DIR)
+    parser.add_argument('--workers', type=int, default=None)
+    parser.add_argument('--no-per-player', action='store_true', help='skip single-player views')
+    parser.add_argument('--game-csv', help='read game_indexed from csv instead of the database')
+    parser.add_argument('--summary-csv', help='read player_summary from csv instead of the database')
+    args = parser.parse_args()
+
+    df_game = pd.read_csv(args.game_csv) if args.game_csv else loaders.load_game()
+    df_summary = (loaders.add_roster(pd.read_csv(args.summary_csv)) if args.summary_csv
+                  else loaders.load_summary())
+
+    out_dir = export_snapshot(df_game, df_summary, root=args.out,
+                              per_player=not args.no_per_player, workers=args.workers)
+    print(f"Snapshot written to {out_dir}")
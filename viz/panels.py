@@ -0,0 +1,163 @@
+import streamlit as st
+
+import loaders
+import startup
+
+## dashboard panels
+# each panel imports its heavy modules (plotly, seaborn, sklearn) and loads its
+# data on first use, so the app only pays for the panel being shown
+
+
+VIEWS = ["All players", "Select Players", "Top 5 Overall",
+         "Top 5 Most Improved", "Bottom 5 Overall"]
+
+
+def view_players(df_game, mode, players=None):
+    """
+    df_game: game_indexed table
+    mode: one of VIEWS
+    players: chosen players for "Select Players"
+    returns the players in the view, or None for all players
+    """
+
+    final_rank = (df_game.sort_values("game_index").groupby("player").tail(1).sort_values("cumulative_rank"))
+
+    rank_change = (
+        df_game
+        .sort_values("game_index")
+        .groupby("player")
+        .agg(
+            start_rank=("cumulative_rank", "first"),
+            end_rank=("cumulative_rank", "last")
+        )
+        .assign(improvement=lambda d: d["start_rank"] - d["end_rank"])
+        .sort_values("improvement", ascending=False)
+    )
+
+    if mode == "All players":
+        return None
+    elif mode == "Select Players":
+        return list(players)
+    elif mode == "Top 5 Overall":
+        return list(final_rank.head(5)["player"])
+    elif mode == "Top 5 Most Improved":
+        return list(rank_change.head(5).index)
+    elif mode== "Bottom 5 Overall":
+        return list(final_rank.tail(5)["player"])
+    raise ValueError(f"Unknown view '{mode}'.")
+
+
+def filter_view(df_game, df_summary, players):
+    """
+    players: list from view_players(), None keeps everyone
+    returns (filtered_game, filtered_summary)
+    """
+
+    if players is None:
+        return df_game, df_summary
+    return df_game[df_game["player"].isin(players)], df_summary[df_summary["player"].isin(players)]
+
+
+def default_players(df_game):
+    """
+    returns the preselected players for "Select Players"
+    """
+
+    return list(df_game["player"].unique()[:3])
+
+
+def filter_players(df_game, df_summary):
+    """
+    df_game: game_indexed table
+    df_summary: player_summary table
+    shows the view selector and returns (filtered_game, filtered_summary)
+    """
+
+    mode = st.selectbox("View", VIEWS)
+
+    players = None
+    if mode == "Select Players":
+        players = st.multiselect(
+            "Choose players",
+            df_game["player"].unique(),
+            default=default_players(df_game)
+        )
+
+    return filter_view(df_game, df_summary, view_players(df_game, mode, players))
+
+
+def rankings_panel():
+    """
+    rank, goals and points plots for the selected view
+    """
+
+    startup.import_panel('Rankings')
+    from utils import plot_cumulative, plot_bubble, player_histogram, create_heatmap, plot_goals_and_rank
+
+    df_game = loaders.load_game()
+    df_summary = loaders.load_summary()
+    filtered_game, filtered_summary = filter_players(df_game, df_summary)
+
+    # -- get plots --
+
+    cumulative = plot_cumulative(filtered_game)
+    st.plotly_chart(cumulative, use_container_width=True)
+
+    bubble = plot_bubble(filtered_game)
+    st.plotly_chart(bubble, use_container_width=True)
+
+    bar = player_histogram(filtered_game)
+    st.plotly_chart(bar, use_container_width=True)
+
+    heat = create_heatmap(filtered_game)
+    st.plotly_chart(heat, use_container_width=True)
+
+    fig1, fig2 = plot_goals_and_rank(filtered_summary)
+    col1, col2 = st.columns(2)
+    with col1:
+        st.plotly_chart(fig1, use_container_width=True)
+    with col2:
+        st.plotly_chart(fig2, use_container_width=True)
+
+
+def clustering_panel():
+    """
+    kmeans clusters of individual games - the only panel that loads sklearn
+    """
+
+    startup.import_panel('Clustering')
+    from utils import plot_game_clusters, plot_cluster_heatmap
+    from ml import cluster_games
+
+    df_game = loaders.load_game()
+
+    # sidebar controls
+    st.sidebar.header("Clustering Options")
+    features = st.sidebar.multiselect(
+        "Features for clustering",
+        options=['goals', 'team_pts', 'rank_in_game', 'cumulative_score', 'cumulative_percentile'],
+        default=['goals', 'team_pts', 'rank_in_game', 'cumulative_score']
+    )
+    n_clusters = st.sidebar.slider("Number of clusters", 2, 6, 3)
+    if len(features) < 2:
+        st.info("Choose at least two features.")
+        return
+
+    # perform clustering
+    clustered_df, kmeans_model = cluster_games(df_game, features=features, n_clusters=n_clusters)
+
+    # scatter plot
+    st.subheader("Scatter Plot of Clusters")
+    scatter_fig = plot_game_clusters(clustered_df, x=features[0], y=features[1])
+    st.plotly_chart(scatter_fig, use_container_width=True)
+
+    # heatmap
+    st.subheader("Cluster Heatmap: Player vs Game Index")
+    heatmap_fig = plot_cluster_heatmap(clustered_df)
+    st.plotly_chart(heatmap_fig, use_container_width=True)
+
+
+PANELS = {
+    'Rankings': rankings_panel,
+    'Clustering': clustering_panel,
+}
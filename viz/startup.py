@@ -0,0 +1,116 @@
+import argparse
+import csv
+import importlib
+import os
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime
+
+## startup profiling and cache prewarm for the dashboard
+# keep this module light - app.py imports it before anything heavy
+
+# heavy modules each panel needs, imported the first time the panel is shown
+PANEL_MODULES = {
+    'Rankings': ['utils'],
+    'Clustering': ['utils', 'ml'],
+}
+PROFILE_FILE = 'startup_profile.csv'
+
+# first-time cost per stage in this process, e.g. {'import:utils': 1.2}
+timings = {}
+
+
+@contextmanager
+def timed(label):
+    """
+    label: stage name, 'import:<module>' or 'query:<table>' by convention
+    records the first run of the block in timings
+    """
+
+    start = time.perf_counter()
+    yield
+    timings.setdefault(label, time.perf_counter() - start)
+
+
+def import_panel(panel):
+    """
+    panel: key of PANEL_MODULES
+    imports the panel's modules, timing each first import
+    """
+
+    for name in PANEL_MODULES[panel]:
+        if name not in sys.modules:
+            with timed(f'import:{name}'):
+                importlib.import_module(name)
+
+
+def prewarm():
+    """
+    imports every panel's modules and loads the tables, so the first
+    user request finds everything cached
+    """
+
+    import loaders
+
+    for panel in PANEL_MODULES:
+        import_panel(panel)
+    loaders.load_game()
+    loaders.load_summary()
+
+
+def profile(out_file=PROFILE_FILE):
+    """
+    times a cold start in this (fresh) process and appends it to out_file
+    returns dict of stage -> seconds
+    """
+
+    with timed('import:streamlit'):
+        import streamlit
+    try:
+        prewarm()
+    except Exception as e:
+        # no database: still record the import times
+        print(f"prewarm incomplete: {e}")
+
+    ts = datetime.now().isoformat(timespec='seconds')
+    new_file = not os.path.exists(out_file)
+    with open(out_file, 'a', newline='') as f:
+        writer = csv.writer(f)
+        if new_file:
+            writer.writerow(['timestamp', 'stage', 'seconds'])
+        for stage, seconds in timings.items():
+            writer.writerow([ts, stage, round(seconds, 4)])
+
+    return dict(timings)
+
+
+def serve(streamlit_args):
+    """
+    streamlit_args: extra args for `streamlit run`
+    runs the app server in this process with prewarm() in a background thread,
+    so caches fill while the server starts instead of on the first request
+    """
+
+    from streamlit.web import cli as stcli
+
+    threading.Thread(target=prewarm, name='prewarm', daemon=True).start()
+    sys.argv = ['streamlit', 'run', 'app.py', *streamlit_args]
+    sys.exit(stcli.main())
+
+
+if __name__ == '__main__':
+    # run through the imported module: loaders, panels and app.py all record into
+    # startup.timings, and this file as __main__ would hold a second, unused copy
+    import startup
+
+    parser = argparse.ArgumentParser(description='Dashboard startup profile and prewarmed server.')
+    parser.add_argument('command', choices=['profile', 'serve'])
+    args, rest = parser.parse_known_args()
+
+    if args.command == 'profile':
+        for stage, seconds in startup.profile().items():
+            print(f"{stage:<30} {seconds:.3f}s")
+    else:
+        startup.serve(rest)
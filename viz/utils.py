@@ -232,12 +232,14 @@ def create_heatmap(df, value_col="goals"):
 
     return fig
 
-def plot_goals_and_rank(df):
+def plot_goals_and_rank(df, color_by=None):
     """
     df: overall/summary df
+    color_by: "Position" or "Year" to skip the selector widgets (static export)
     scatter plot of total goals vs total points, with color selectable by position or year
     """
 
+    df = df.copy()
     df["final_rank"] = df["overall_score"].rank(ascending=False, method="min")
 
     # --- color scale selector ---
@@ -249,25 +251,28 @@ def plot_goals_and_rank(df):
 
     color_col = None
     if len(color_options) > 0:
-        color_choice = st.selectbox("Color by", options=color_options)
+        interactive = color_by is None
+        color_choice = st.selectbox("Color by", options=color_options) if interactive else color_by
         color_col = "position" if color_choice == "Position" else "year"
 
         # --- only show filters after color is selected ---
         if color_col == "position":
-            selected_positions = st.multiselect(
-                "Select Positions",
-                options=df["position"].unique(),
-                default=df["position"].unique()
-            )
-            df = df[df["position"].isin(selected_positions)]
+            if interactive:
+                selected_positions = st.multiselect(
+                    "Select Positions",
+                    options=df["position"].unique(),
+                    default=df["position"].unique()
+                )
+                df = df[df["position"].isin(selected_positions)]
             palette = px.colors.sequential.Magma
         else:
-            selected_years = st.multiselect(
-                "Select Years",
-                options=df["year"].unique(),
-                default=df["year"].unique()
-            )
-            df = df[df["year"].isin(selected_years)]
+            if interactive:
+                selected_years = st.multiselect(
+                    "Select Years",
+                    options=df["year"].unique(),
+                    default=df["year"].unique()
+                )
+                df = df[df["year"].isin(selected_years)]
             palette = px.colors.sequential.Inferno
 
     # --- scatter: points vs goals ---